@@ -18,6 +18,73 @@ class AudioConcatenator:
         self.silence_duration = silence_duration
         self.fade_duration = fade_duration
     
+    def prepare_chunk(self, audio_data, sample_rate: int, index: int = 0):
+        """
+        Normalize one raw model output into a faded, 1D float chunk.
+
+        This is the per-chunk half of concatenation, split out so callers
+        can run it on a CPU worker while the GPU synthesizes later chunks.
+
+        Args:
+            audio_data: Raw chunk output (tensor, array, or tuple thereof)
+            sample_rate: Sample rate for the audio
+            index: Chunk index, used only for logging
+
+        Returns:
+            Prepared 1D numpy array, or None for an empty chunk
+        """
+        import numpy as np
+
+        print(f"Processing chunk {index}: type={type(audio_data)}")
+
+        # Handle tuple format (common from TTS models)
+        if isinstance(audio_data, tuple):
+            audio_data = audio_data[0]  # Extract audio array from tuple
+            print(f"  Extracted from tuple: type={type(audio_data)}")
+
+        # Convert torch tensor to numpy if needed
+        if hasattr(audio_data, 'cpu'):  # It's a torch tensor
+            audio_data = audio_data.cpu().numpy()
+            print(f"  Converted from torch: shape={audio_data.shape}")
+
+        # Convert to numpy array if needed
+        if not isinstance(audio_data, np.ndarray):
+            audio_data = np.array(audio_data)
+
+        print(f"  Final shape before processing: {audio_data.shape}")
+
+        # Handle different audio shapes
+        if audio_data.ndim == 1:
+            # Already 1D, perfect
+            normalized_audio = audio_data
+        elif audio_data.ndim == 2:
+            # Handle 2D audio - could be (channels, samples) or (samples, channels)
+            if audio_data.shape[0] < audio_data.shape[1]:
+                # Likely (channels, samples) - take first channel
+                normalized_audio = audio_data[0, :]
+                print(f"  Used first channel from (C, L) format: {normalized_audio.shape}")
+            else:
+                # Likely (samples, channels) - take first channel
+                normalized_audio = audio_data[:, 0]
+                print(f"  Used first channel from (L, C) format: {normalized_audio.shape}")
+        else:
+            # Flatten higher dimensional arrays
+            normalized_audio = audio_data.flatten()
+            print(f"  Flattened {audio_data.ndim}D array: {normalized_audio.shape}")
+
+        # Ensure we have valid audio data
+        if len(normalized_audio) == 0:
+            print(f"  Warning: Empty audio chunk {index}")
+            return None
+
+        print(f"  Chunk {index} final length: {len(normalized_audio)} samples ({len(normalized_audio)/sample_rate:.2f}s)")
+
+        # Normalize audio levels
+        normalized_audio = self._normalize_audio(normalized_audio)
+
+        # Apply fade effects
+        return self._apply_fade_effects(normalized_audio, sample_rate)
+
     def concatenate_audio_chunks(self, audio_chunks: List, sample_rate: int):
         """
         Concatenate multiple audio chunks into a single audio file.
@@ -39,91 +106,46 @@ class AudioConcatenator:
                 return audio[0]  # Extract audio data from tuple
             return audio
         
+        prepared = [self.prepare_chunk(chunk, sample_rate, i) for i, chunk in enumerate(audio_chunks)]
+        return self.concatenate_prepared(prepared, sample_rate)
+
+    def concatenate_prepared(self, prepared_chunks: List, sample_rate: int):
+        """
+        Stitch chunks already run through prepare_chunk into one array.
+
+        Args:
+            prepared_chunks: Prepared 1D arrays (None entries are skipped)
+            sample_rate: Sample rate for the audio
+
+        Returns:
+            Concatenated audio array
+        """
         import numpy as np
-        import torch
-        
-        # Normalize and prepare audio data
-        normalized_chunks = []
-        for i, audio_data in enumerate(audio_chunks):
-            print(f"Processing chunk {i}: type={type(audio_data)}")
-            
-            # Handle tuple format (common from TTS models)
-            if isinstance(audio_data, tuple):
-                audio_data = audio_data[0]  # Extract audio array from tuple
-                print(f"  Extracted from tuple: type={type(audio_data)}")
-            
-            # Convert torch tensor to numpy if needed
-            if hasattr(audio_data, 'cpu'):  # It's a torch tensor
-                audio_data = audio_data.cpu().numpy()
-                print(f"  Converted from torch: shape={audio_data.shape}")
-            
-            # Convert to numpy array if needed
-            if not isinstance(audio_data, np.ndarray):
-                audio_data = np.array(audio_data)
-            
-            print(f"  Final shape before processing: {audio_data.shape}")
-            
-            # Handle different audio shapes
-            if audio_data.ndim == 1:
-                # Already 1D, perfect
-                normalized_audio = audio_data
-            elif audio_data.ndim == 2:
-                # Handle 2D audio - could be (channels, samples) or (samples, channels)
-                if audio_data.shape[0] < audio_data.shape[1]:
-                    # Likely (channels, samples) - take first channel
-                    normalized_audio = audio_data[0, :]
-                    print(f"  Used first channel from (C, L) format: {normalized_audio.shape}")
-                else:
-                    # Likely (samples, channels) - take first channel
-                    normalized_audio = audio_data[:, 0]
-                    print(f"  Used first channel from (L, C) format: {normalized_audio.shape}")
-            else:
-                # Flatten higher dimensional arrays
-                normalized_audio = audio_data.flatten()
-                print(f"  Flattened {audio_data.ndim}D array: {normalized_audio.shape}")
-            
-            # Ensure we have valid audio data
-            if len(normalized_audio) == 0:
-                print(f"  Warning: Empty audio chunk {i}")
-                continue
-            
-            print(f"  Chunk {i} final length: {len(normalized_audio)} samples ({len(normalized_audio)/sample_rate:.2f}s)")
-            
-            # Normalize audio levels
-            normalized_audio = self._normalize_audio(normalized_audio)
-            
-            # Apply fade effects
-            normalized_audio = self._apply_fade_effects(normalized_audio, sample_rate)
-            
-            normalized_chunks.append(normalized_audio)
-        
+
+        normalized_chunks = [chunk for chunk in prepared_chunks if chunk is not None]
         if not normalized_chunks:
             raise ValueError("No valid audio chunks after processing")
         
         print(f"Successfully processed {len(normalized_chunks)} chunks")
         
-        # Create silence segments
         silence_samples = int(self.silence_duration * sample_rate)
-        silence = np.zeros(silence_samples, dtype=np.float32)
         print(f"Adding {silence_samples} silence samples ({self.silence_duration}s) between chunks")
-        
-        # Concatenate all chunks with silence in between
-        concatenated_segments = []
-        total_audio_length = 0
-        
+
+        # Preallocate the final buffer and write each chunk into its slice:
+        # one allocation and one copy per chunk, with the zero-initialized
+        # gaps doubling as the inter-chunk silence
+        total_audio_length = (
+            sum(len(chunk) for chunk in normalized_chunks)
+            + (len(normalized_chunks) - 1) * silence_samples
+        )
+        final_audio = np.zeros(total_audio_length, dtype=np.float32)
+        cursor = 0
         for i, chunk in enumerate(normalized_chunks):
-            concatenated_segments.append(chunk)
-            total_audio_length += len(chunk)
+            final_audio[cursor:cursor + len(chunk)] = chunk
+            cursor += len(chunk)
             print(f"Added chunk {i}: {len(chunk)} samples")
-            
-            # Add silence between chunks (but not after the last chunk)
             if i < len(normalized_chunks) - 1:
-                concatenated_segments.append(silence)
-                total_audio_length += len(silence)
-                print(f"Added silence: {len(silence)} samples")
-        
-        # Combine all segments
-        final_audio = np.concatenate(concatenated_segments)
+                cursor += silence_samples
         print(f"Final concatenated audio: {len(final_audio)} samples ({len(final_audio)/sample_rate:.2f}s)")
         
         # Final normalization and cleanup
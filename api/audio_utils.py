@@ -27,8 +27,18 @@ class AudioUtils:
         Returns:
             BytesIO buffer containing WAV audio data
         """
+        import torch
+
         buffer = io.BytesIO()
-        ta.save(buffer, wav_tensor, sample_rate, format="wav")
+        if wav_tensor.is_floating_point():
+            # Downcast to int16 before the save: the WAV ends up PCM16 either
+            # way, but converting first halves the bytes moved through every
+            # copy (and the payload size), and the explicit encoding skips
+            # torchaudio's dtype auto-detection
+            pcm = (wav_tensor.clamp(-1.0, 1.0) * 32767).to(torch.int16).cpu()
+            ta.save(buffer, pcm, sample_rate, format="wav", encoding="PCM_S", bits_per_sample=16)
+        else:
+            ta.save(buffer, wav_tensor, sample_rate, format="wav")
         buffer.seek(0)
         return buffer
 
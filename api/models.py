@@ -3,7 +3,7 @@
 Pydantic models for request/response validation and API documentation.
 """
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -23,6 +23,16 @@ class FullTextTTSRequest(BaseModel):
     overlap_sentences: Optional[int] = Field(0, description="Number of sentences to overlap between chunks")
     
 
+class BatchFullTextTTSRequest(BaseModel):
+    """Request model for batched full-text TTS generation of multiple documents."""
+    texts: List[str] = Field(..., description="Texts to convert to speech (any length each)")
+    voice_prompt_base64: Optional[str] = Field(None, description="Base64 encoded voice prompt audio")
+    max_chunk_size: Optional[int] = Field(800, description="Maximum characters per chunk")
+    silence_duration: Optional[float] = Field(0.5, description="Silence duration between chunks (seconds)")
+    fade_duration: Optional[float] = Field(0.1, description="Fade in/out duration (seconds)")
+    overlap_sentences: Optional[int] = Field(0, description="Number of sentences to overlap between chunks")
+
+
 class TTSResponse(BaseModel):
     """Response model for TTS generation with JSON output."""
     success: bool = Field(..., description="Whether the request was successful")
@@ -40,6 +50,13 @@ class FullTextTTSResponse(BaseModel):
     processing_info: Optional[dict] = Field(None, description="Information about the processing (chunks, etc.)")
 
 
+class BatchFullTextTTSResponse(BaseModel):
+    """Response model for batched full-text TTS generation."""
+    success: bool = Field(..., description="Whether the request was successful")
+    message: str = Field(..., description="Status message")
+    results: Optional[List[FullTextTTSResponse]] = Field(None, description="Per-text generation results, in request order")
+
+
 class HealthResponse(BaseModel):
     """Response model for health check endpoint."""
     status: str = Field(..., description="Service status")
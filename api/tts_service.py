@@ -12,7 +12,15 @@ from fastapi.responses import StreamingResponse, Response
 from fastapi import HTTPException, File, UploadFile, Form
 
 from .config import app, image
-from .models import TTSRequest, TTSResponse, HealthResponse, FullTextTTSRequest, FullTextTTSResponse
+from .models import (
+    TTSRequest,
+    TTSResponse,
+    HealthResponse,
+    FullTextTTSRequest,
+    FullTextTTSResponse,
+    BatchFullTextTTSRequest,
+    BatchFullTextTTSResponse,
+)
 from .audio_utils import AudioUtils
 from .text_processing import TextChunker
 from .audio_concatenator import AudioConcatenator
@@ -85,6 +93,72 @@ class ChatterboxTTSService:
                 AudioUtils.cleanup_temp_file(audio_prompt_path)
             raise e
 
+    def _generate_chunk_audios(self, text_chunks, audio_prompt_path=None, on_chunk=None):
+        """Generate audio for every chunk, returned in chunk order.
+
+        When the installed chatterbox build exposes a batched generate, all
+        chunks are stacked into a single forward pass instead of launching
+        one kernel sequence per chunk. Otherwise chunks fan out across a
+        small thread pool as before; voice-cloned requests always take the
+        fallback since the batched API carries no per-call prompt.
+
+        If on_chunk is given it is called with (index, wav) as soon as each
+        chunk finishes, letting the caller overlap post-processing with the
+        synthesis of the remaining chunks.
+        """
+        if audio_prompt_path is None and hasattr(self.model, "generate_batch"):
+            print(f"Running {len(text_chunks)} chunks as one batched forward pass...")
+            results = list(self.model.generate_batch(text_chunks))
+            if on_chunk:
+                for i, wav in enumerate(results):
+                    on_chunk(i, wav)
+            return results
+
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            future_to_index = {
+                executor.submit(self._generate_audio, chunk, audio_prompt_path): i
+                for i, chunk in enumerate(text_chunks)
+            }
+            results = [None] * len(text_chunks)
+            for future in concurrent.futures.as_completed(future_to_index):
+                index = future_to_index[future]
+                results[index] = future.result()
+                if on_chunk:
+                    on_chunk(index, results[index])
+        return results
+
+    def _finalize_audio_tensor(self, final_audio):
+        """Normalize generated/concatenated audio into a (1, L) tensor for saving."""
+        import torch
+        import numpy as np
+
+        processed_tensor = final_audio
+        # Unwrap if it's a single-element tuple repeatedly
+        while isinstance(processed_tensor, tuple) and len(processed_tensor) == 1:
+            processed_tensor = processed_tensor[0]
+
+        # Convert to PyTorch tensor if it's a NumPy array
+        if isinstance(processed_tensor, np.ndarray):
+            processed_tensor = torch.from_numpy(processed_tensor.astype(np.float32))
+
+        if not isinstance(processed_tensor, torch.Tensor): # Check if it's a tensor now
+            raise TypeError(f"Audio data after concatenation is not a tensor. Got type: {type(processed_tensor)}")
+
+        # Ensure correct shape (C, L) for torchaudio.save
+        if processed_tensor.ndim == 1:  # Shape (L,)
+            return processed_tensor.unsqueeze(0)  # Convert to (1, L)
+        elif processed_tensor.ndim == 2: # Shape (C, L)
+            if processed_tensor.shape[0] == 0:
+                raise ValueError(f"Audio tensor has 0 channels: {processed_tensor.shape}")
+            if processed_tensor.shape[0] > 1: # If C > 1 (stereo/multi-channel)
+                print(f"Multi-channel audio (shape {processed_tensor.shape}) detected. Taking the first channel.")
+                return processed_tensor[0, :].unsqueeze(0) # Result is (1, L)
+            return processed_tensor # Already (1, L)
+        else:
+            raise ValueError(f"Unexpected audio tensor dimensions: {processed_tensor.ndim}, shape: {processed_tensor.shape}")
+
     @modal.fastapi_endpoint(docs=True, method="GET")
     def health(self) -> HealthResponse:
         """Health check endpoint to verify model status."""
@@ -324,85 +398,57 @@ class ChatterboxTTSService:
                 final_audio = wav
                 audio_chunks = [wav]  # For consistent processing info
             else:
-                # Process chunks in parallel
-                import concurrent.futures
-                import numpy as np
-                
-                def process_chunk(chunk_text: str):
-                    """Process a single chunk."""
-                    wav_result = self._generate_audio(chunk_text, audio_prompt_path)
-                    # Return the full wav result, not just wav[0]
-                    return wav_result
-                
-                # Use ThreadPoolExecutor for parallel processing
-                with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                    # Submit all chunks for processing
-                    future_to_chunk = {
-                        executor.submit(process_chunk, chunk): i 
-                        for i, chunk in enumerate(text_chunks)
-                    }
-                    
-                    # Collect results in order
-                    results = [None] * len(text_chunks)
-                    for future in concurrent.futures.as_completed(future_to_chunk):
-                        chunk_index = future_to_chunk[future]
-                        try:
-                            audio_result = future.result()
-                            results[chunk_index] = audio_result
-                        except Exception as exc:
-                            print(f'Chunk {chunk_index} generated an exception: {exc}')
-                            raise HTTPException(status_code=500, detail=f"Failed to process chunk {chunk_index}: {str(exc)}")
-                
-                # Filter out None results
-                audio_chunks = [result for result in results if result is not None]
-                
-                if len(audio_chunks) != len(text_chunks):
-                    raise HTTPException(status_code=500, detail=f"Only {len(audio_chunks)} out of {len(text_chunks)} chunks processed successfully")
-                
-                # Concatenate audio chunks
-                print("Concatenating audio chunks...")
+                import queue
+                import threading
+
                 concatenator = AudioConcatenator(
                     silence_duration=request.silence_duration,
                     fade_duration=request.fade_duration
                 )
-                
-                final_audio = concatenator.concatenate_audio_chunks(audio_chunks, self.model.sr)
+
+                # Pipeline synthesis with stitching prep: a CPU worker fades
+                # and normalizes each chunk as soon as it is generated, so
+                # post-processing overlaps GPU work instead of following it
+                prepared = [None] * len(text_chunks)
+                post_queue = queue.Queue()
+
+                def post_process_worker():
+                    while True:
+                        item = post_queue.get()
+                        if item is None:
+                            break
+                        index, wav = item
+                        prepared[index] = concatenator.prepare_chunk(wav, self.model.sr, index)
+
+                post_worker = threading.Thread(target=post_process_worker)
+                post_worker.start()
+                try:
+                    audio_chunks = self._generate_chunk_audios(
+                        text_chunks,
+                        audio_prompt_path,
+                        on_chunk=lambda index, wav: post_queue.put((index, wav))
+                    )
+                except Exception as exc:
+                    print(f'Chunk processing generated an exception: {exc}')
+                    raise HTTPException(status_code=500, detail=f"Failed to process chunks: {str(exc)}")
+                finally:
+                    post_queue.put(None)
+                    post_worker.join()
+
+                if len([chunk for chunk in audio_chunks if chunk is not None]) != len(text_chunks):
+                    raise HTTPException(status_code=500, detail=f"Only {len(audio_chunks)} out of {len(text_chunks)} chunks processed successfully")
+
+                # Stitch the already-prepared chunks
+                print("Concatenating audio chunks...")
+                final_audio = concatenator.concatenate_prepared(prepared, self.model.sr)
             
-            # --- Start of new audio processing logic ---
-            import torch
-            import numpy as np
-
-            processed_tensor = final_audio
-            # Unwrap if it's a single-element tuple repeatedly
-            while isinstance(processed_tensor, tuple) and len(processed_tensor) == 1:
-                processed_tensor = processed_tensor[0]
-
-            # Convert to PyTorch tensor if it's a NumPy array
-            if isinstance(processed_tensor, np.ndarray):
-                processed_tensor = torch.from_numpy(processed_tensor.astype(np.float32))
-
-            if not isinstance(processed_tensor, torch.Tensor): # Check if it's a tensor now
-                raise TypeError(f"Audio data after concatenation is not a tensor. Got type: {type(processed_tensor)}")
-
-            # Ensure correct shape (C, L) for torchaudio.save
-            if processed_tensor.ndim == 1:  # Shape (L,)
-                audio_to_save = processed_tensor.unsqueeze(0)  # Convert to (1, L)
-            elif processed_tensor.ndim == 2: # Shape (C, L)
-                if processed_tensor.shape[0] == 0:
-                    raise ValueError(f"Audio tensor has 0 channels: {processed_tensor.shape}")
-                if processed_tensor.shape[0] > 1: # If C > 1 (stereo/multi-channel)
-                    print(f"Multi-channel audio (shape {processed_tensor.shape}) detected. Taking the first channel.")
-                    audio_to_save = processed_tensor[0, :].unsqueeze(0) # Result is (1, L)
-                else: # Already (1, L)
-                    audio_to_save = processed_tensor
-            else:
-                raise ValueError(f"Unexpected audio tensor dimensions: {processed_tensor.ndim}, shape: {processed_tensor.shape}")
+            audio_to_save = self._finalize_audio_tensor(final_audio)
             buffer = AudioUtils.save_audio_to_buffer(audio_to_save, self.model.sr)
             duration = audio_to_save.shape[1] / self.model.sr # Use shape[1] for length
-            
+
             # Reset buffer position for reading
             buffer.seek(0)
-            # --- End of new audio processing logic ---            # Prepare processing info
+            # Prepare processing info
             processing_info = {
                 "total_chunks": len(text_chunks),
                 "processed_chunks": len(audio_chunks),
@@ -430,3 +476,79 @@ class ChatterboxTTSService:
             error_msg = f"Full text audio generation failed: {str(e)}"
             print(f"Exception in full text generation: {error_msg}")
             raise HTTPException(status_code=500, detail=error_msg)
+
+    @modal.fastapi_endpoint(docs=True, method="POST")
+    def generate_full_text_batch(self, request: BatchFullTextTTSRequest) -> BatchFullTextTTSResponse:
+        """
+        Generate speech for several full texts in a single request.
+
+        Chunks from every text are scheduled on one worker pool, so GPU work
+        is pipelined across documents instead of paying one HTTP round-trip
+        and one scheduling pass per text. Results are returned as base64
+        audio in request order.
+
+        Args:
+            request: BatchFullTextTTSRequest containing texts and processing parameters
+
+        Returns:
+            BatchFullTextTTSResponse with per-text base64 audio and durations
+        """
+        try:
+            if not request.texts:
+                raise HTTPException(status_code=400, detail="texts cannot be empty")
+            for text in request.texts:
+                self._validate_text_input(text)
+            audio_prompt_path = self._process_voice_prompt(request.voice_prompt_base64)
+
+            # Chunk every text up front so all chunks share one scheduling pass
+            chunker = TextChunker(
+                max_chunk_size=request.max_chunk_size,
+                overlap_sentences=request.overlap_sentences
+            )
+            per_text_chunks = [chunker.chunk_text(text) for text in request.texts]
+            total_chunks = sum(len(chunks) for chunks in per_text_chunks)
+            print(f"Processing batch of {len(request.texts)} texts ({total_chunks} chunks total)...")
+
+            # Flatten chunks from every text so they share one batched pass
+            # (or one worker-pool scheduling round), then re-split per text
+            flat_chunks = [chunk for chunks in per_text_chunks for chunk in chunks]
+            flat_wavs = iter(self._generate_chunk_audios(flat_chunks, audio_prompt_path))
+
+            concatenator = AudioConcatenator(
+                silence_duration=request.silence_duration,
+                fade_duration=request.fade_duration
+            )
+
+            responses = []
+            for text_index, chunks in enumerate(per_text_chunks):
+                audio_chunks = [next(flat_wavs) for _ in chunks]
+                if len(audio_chunks) == 1:
+                    final_audio = audio_chunks[0]
+                else:
+                    final_audio = concatenator.concatenate_audio_chunks(audio_chunks, self.model.sr)
+                audio_to_save = self._finalize_audio_tensor(final_audio)
+                buffer = AudioUtils.save_audio_to_buffer(audio_to_save, self.model.sr)
+                duration = audio_to_save.shape[1] / self.model.sr
+                responses.append(FullTextTTSResponse(
+                    success=True,
+                    message="Audio generated successfully",
+                    audio_base64=base64.b64encode(buffer.read()).decode('utf-8'),
+                    duration_seconds=duration,
+                    processing_info={
+                        "total_chunks": len(chunks),
+                        "sample_rate": self.model.sr,
+                        "duration": duration
+                    }
+                ))
+
+            return BatchFullTextTTSResponse(
+                success=True,
+                message=f"Generated audio for {len(responses)} texts",
+                results=responses
+            )
+
+        except HTTPException as http_exc:
+            return BatchFullTextTTSResponse(success=False, message=str(http_exc.detail))
+        except Exception as e:
+            print(f"Error in batch full text generation: {str(e)}")
+            return BatchFullTextTTSResponse(success=False, message=f"Batch audio generation failed: {str(e)}")
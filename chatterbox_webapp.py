@@ -29,7 +29,12 @@ image = modal.Image.debian_slim(python_version="3.12").pip_install(
     "pydantic", 
     "numpy",
     "websockets",
-    "python-multipart"
+    "python-multipart",
+    "pybase64",
+    "orjson",
+    "brotli",
+    "rcssmin",
+    "rjsmin"
 )
 
 # Add the webapp directory to the image so it's available in the container
@@ -1,13 +1,41 @@
+import threading
 import requests
 import gradio as gr
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so warmed-up connections are reused by the actual POSTs.
+# Modal endpoints cold-start on the first hit and can answer 502/503/504
+# while the container spins up; retry those with exponential backoff
+# instead of surfacing a transient error to the UI. pool_block avoids a
+# thundering herd of new connections when concurrent retries line up.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    max_retries=Retry(
+        total=3,
+        status_forcelist=(502, 503, 504),
+        backoff_factor=1.5,
+        allowed_methods=frozenset(["POST"])
+    ),
+    pool_connections=10,
+    pool_maxsize=20,
+    pool_block=True
+))
+
+def _warm_connection(endpoint):
+    """Best-effort probe to establish DNS/TCP/TLS before the real request."""
+    try:
+        _session.head(endpoint, timeout=5)
+    except requests.RequestException:
+        pass
 
 def send_text_request(text_input, endpoint, progress=None):
     payload = {"text": text_input}
-    response = requests.post(
+    response = _session.post(
         endpoint,
         json=payload,
         headers={"Content-Type": "application/json"},
-        timeout=120,
+        timeout=(5, 120),  # (connect, read): fail fast on handshake, allow model latency
         stream=True
     )
     if response.status_code != 200:
@@ -15,14 +43,19 @@ def send_text_request(text_input, endpoint, progress=None):
     return response
 
 def send_voice_clone_request(text_input, audio_prompt_input, endpoint, progress=None):
+    # Kick off the connection handshake while we read the reference audio,
+    # so the POST below reuses a warm pooled connection
+    warmup = threading.Thread(target=_warm_connection, args=(endpoint,), daemon=True)
+    warmup.start()
     files = {'text': (None, text_input)}
     with open(audio_prompt_input, 'rb') as f:
         audio_content = f.read()
     files['voice_prompt'] = ('voice_prompt.wav', audio_content, 'audio/wav')
-    response = requests.post(
+    warmup.join(timeout=5)
+    response = _session.post(
         endpoint,
         files=files,
-        timeout=180,
+        timeout=(5, 180),  # (connect, read): fail fast on handshake, allow model latency
         stream=True
     )
     if response.status_code != 200:
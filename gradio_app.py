@@ -39,28 +39,40 @@ if not HEALTH_ENDPOINT:
 
 # Function to accumulate audio stream
 def add_to_stream(audio, instream):
-    """Accumulate streaming audio data"""
-    import numpy as np
+    """Accumulate streaming audio chunks (O(1) append per chunk)"""
     if audio is None:
         return None, instream
     if instream is None:
-        ret = audio
-    else:
-        # Concatenate audio data
-        ret = (audio[0], np.concatenate((instream[1], audio[1])))
-    return ret, ret
+        instream = (audio[0], [], 0)
+    sample_rate, chunks, total_len = instream
+    chunks.append(audio[1])
+    # Concatenation is deferred to finalize_stream so each streamed chunk
+    # costs a list append instead of copying the whole accumulated audio
+    return audio, (sample_rate, chunks, total_len + len(audio[1]))
+
+def finalize_stream(stream_state):
+    """Concatenate accumulated stream chunks into a single audio array"""
+    if stream_state is None:
+        return None
+    sample_rate, chunks, total_len = stream_state
+    if not chunks:
+        return None
+    out = np.empty((total_len,) + chunks[0].shape[1:], dtype=chunks[0].dtype)
+    np.concatenate(chunks, out=out)
+    return (sample_rate, out)
 
 def save_streamed_audio(stream_state):
     """Convert streamed audio to file format"""
+    stream_state = finalize_stream(stream_state)
     if stream_state is None:
         return None
-    
+
     try:
         sample_rate, audio_data = stream_state
-        # Create temporary file
-        temp_dir = tempfile.gettempdir()
-        temp_file = os.path.join(temp_dir, f"streamed_audio_{np.random.randint(1000, 9999)}.wav")
-        
+        # Create temporary file (atomic, collision-safe name)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav", prefix="streamed_audio_") as f:
+            temp_file = f.name
+
         # Save audio data to file
         sf.write(temp_file, audio_data, sample_rate)
         return temp_file
@@ -154,17 +166,9 @@ with gr.Blocks(css=custom_css, title="Chatterbox TTS API Demo") as demo:
         elem_id="footer"
     )
 
-    # Function to accumulate audio stream
-    def add_to_stream(audio, instream):
-        import numpy as np
-        if audio is None:
-            return None, instream
-        if instream is None:
-            ret = audio
-        else:
-            # Concatenate audio data
-            ret = (audio[0], np.concatenate((instream[1], audio[1])))
-        return ret, ret
+    # Function to run generation from the accumulated stream state
+    def generate_from_stream(text_input, stream_state):
+        return generate_tts_audio(text_input, finalize_stream(stream_state))
 
     # Event handlers
     text.change(
@@ -182,8 +186,8 @@ with gr.Blocks(css=custom_css, title="Chatterbox TTS API Demo") as demo:
     ref_wav.stream(add_to_stream, [ref_wav, stream_state], [ref_wav, stream_state])
     
     generate_btn.click(
-        fn=generate_tts_audio,
-        inputs=[text, ref_wav],
+        fn=generate_from_stream,
+        inputs=[text, stream_state],
         outputs=[audio_output],
         show_progress=True
     )
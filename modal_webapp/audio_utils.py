@@ -1,33 +1,127 @@
 # Audio utility functions for Chatterbox TTS Web App
+import functools
 import io
-import base64
 import tempfile
 import os
 from .model import get_model
 
+# pybase64 encodes with SIMD (SSSE3/AVX2/NEON) — 4-10x faster on the
+# multi-megabyte WAV payloads this module produces
 try:
-    import modal
-    with modal.imports():
-        import torchaudio as ta
-except (ImportError, AttributeError):
-    # Fallback for local development
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+@functools.lru_cache(maxsize=1)
+def _ta():
+    """Import torchaudio on first use.
+
+    Deferring the import keeps the ~1-2 s torchaudio load (and its native
+    backend probing) off the web app's cold-start path, so routes that never
+    touch audio (health, page load) don't pay for it.
+    """
     try:
-        import torchaudio as ta
-    except ImportError:
-        ta = None
+        import modal
+        with modal.imports():
+            import torchaudio
+    except (ImportError, AttributeError):
+        # Fallback for local development
+        try:
+            import torchaudio
+        except ImportError:
+            return None
+    return torchaudio
+
+# Sample rate is fixed per loaded model; cache it so the hot encode path
+# doesn't go through get_model() on every request
+_SR = None
+
+def _sr() -> int:
+    global _SR
+    if _SR is None:
+        _SR = get_model().sr
+    return _SR
+
+def _wav_header(data_size: int, channels: int, sr: int) -> bytes:
+    """Build the fixed 44-byte RIFF/WAVE header for 16-bit PCM."""
+    return b"".join((
+        b"RIFF", (data_size + 36).to_bytes(4, "little"), b"WAVEfmt ",
+        (16).to_bytes(4, "little"),            # fmt chunk size
+        (1).to_bytes(2, "little"),             # PCM
+        channels.to_bytes(2, "little"),
+        sr.to_bytes(4, "little"),
+        (sr * channels * 2).to_bytes(4, "little"),  # byte rate
+        (channels * 2).to_bytes(2, "little"),  # block align
+        (16).to_bytes(2, "little"),            # bits per sample
+        b"data", data_size.to_bytes(4, "little"),
+    ))
+
+def _write_wav_pcm16(buffer, wav_tensor, sr):
+    """Encode a float audio tensor as 16-bit PCM WAV directly.
+
+    A PCM16 WAV is just a fixed header plus the raw little-endian samples,
+    so the header is built by hand and the sample buffer written as-is —
+    no torchaudio backend dispatch, no wave-module bookkeeping, and half
+    the payload of the float32 WAV torchaudio would emit.
+    """
+    import torch
+    pcm = wav_tensor.detach().cpu().clamp(-1.0, 1.0).mul(32767).to(torch.int16).numpy()
+    # Frames interleave across channels in the data chunk
+    data = pcm.T.tobytes()
+    buffer.write(_wav_header(len(data), pcm.shape[0], sr))
+    buffer.write(data)
+
+def load_reference_audio(audio_data: bytes):
+    """Decode uploaded reference audio in memory.
+
+    Returns the (waveform, sample_rate) pair from torchaudio without ever
+    touching disk — no temp-file write, fsync, or unlink per request.
+    Prefer this over save_temp_audio_file wherever the consumer can take a
+    tensor instead of a path.
+    """
+    ta = _ta()
+    if ta is None:
+        raise RuntimeError("torchaudio not available")
+    return ta.load(io.BytesIO(audio_data))
+
+# model.generate only takes a path, so prompt bytes have to hit a filesystem;
+# tmpfs keeps the round trip in RAM instead of touching disk
+_TMPFS_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
 def save_temp_audio_file(audio_data: bytes) -> str:
-    """Save uploaded audio data to a temporary file."""
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+    """Save uploaded audio data to a temporary file.
+
+    Legacy shim for path-based consumers (model.generate takes
+    audio_prompt_path); new code should use load_reference_audio.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav", dir=_TMPFS_DIR) as temp_file:
         temp_file.write(audio_data)
         return temp_file.name
 
+def _wav_buffer(wav_tensor) -> io.BytesIO:
+    """Encode the tensor as WAV into a BytesIO without copying it out."""
+    buffer = io.BytesIO()
+    if wav_tensor.is_floating_point() and wav_tensor.dim() == 2:
+        _write_wav_pcm16(buffer, wav_tensor, _sr())
+    else:
+        ta = _ta()
+        if ta is None:
+            raise RuntimeError("torchaudio not available")
+        ta.save(buffer, wav_tensor, _sr(), format="wav")
+    return buffer
+
+def audio_to_wav_bytes(wav_tensor) -> bytes:
+    """Convert audio tensor to raw WAV bytes.
+
+    Binary routes should use this directly — base64 only exists for JSON
+    payloads, and round-tripping through it costs an extra copy plus 33%
+    more bytes on the wire.
+    """
+    return _wav_buffer(wav_tensor).getvalue()
+
 def audio_to_base64(wav_tensor) -> str:
     """Convert audio tensor to base64 string."""
-    if ta is None:
-        raise RuntimeError("torchaudio not available")
-    model = get_model()
-    buffer = io.BytesIO()
-    ta.save(buffer, wav_tensor, model.sr, format="wav")
-    buffer.seek(0)
-    return base64.b64encode(buffer.read()).decode('utf-8')
+    # getbuffer() hands the encoder a zero-copy view of the BytesIO, so the
+    # WAV is never materialized as a second bytes object; ascii decode is
+    # faster than utf-8 for base64's pure-ASCII output
+    return _b64encode(_wav_buffer(wav_tensor).getbuffer()).decode('ascii')
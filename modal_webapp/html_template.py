@@ -1,13 +1,29 @@
 
-# Web interface HTML with WebSocket streaming support
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Chatterbox TTS - Real-time Streaming</title>
-    <style>
+import gzip
+import hashlib
+
+from fastapi.responses import Response
+
+# brotli beats gzip by ~15-20% on text; optional, gzip covers every client
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Minifiers are optional; unminified assets are served verbatim without them
+try:
+    from rcssmin import cssmin
+except ImportError:
+    def cssmin(source):
+        return source
+try:
+    from rjsmin import jsmin
+except ImportError:
+    def jsmin(source):
+        return source
+
+# Page styles, served as an external stylesheet so browsers cache them
+_CSS_SRC = """
         * {
             margin: 0;
             padding: 0;
@@ -200,72 +216,37 @@ HTML_TEMPLATE = """
             border-radius: 5px;
             cursor: pointer;
         }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🗣️ Chatterbox TTS</h1>
-            <p>Real-time Text-to-Speech with Voice Cloning</p>
-        </div>
-
-        <div class="form-group">
-            <label for="textInput">Text to synthesize:</label>
-            <textarea id="textInput" placeholder="Enter the text you want to convert to speech (max 1000 characters)">Hello! This is a test of the Chatterbox TTS system with real-time streaming.</textarea>
-            <div class="char-counter" id="charCounter">0/1000</div>
-        </div>
-
-        <div class="accordion">
-            <div class="accordion-header" onclick="toggleAccordion()">
-                🎤 Voice Cloning (Optional)
-                <span id="accordionIcon">▼</span>
-            </div>
-            <div class="accordion-content" id="accordionContent">
-                <input type="file" id="voiceFile" accept="audio/*" class="file-input">
-                <div style="margin-top: 10px; font-size: 0.9em; color: #666;">
-                    Upload a clear audio sample (5-30 seconds) to clone a voice. Supported formats: WAV, MP3, MPEG.
-                </div>
-            </div>
-        </div>
-
-        <button class="generate-btn" id="generateBtn" onclick="generateSpeech()">
-            🎵 Generate Speech
-        </button>
-
-        <div class="progress-container" id="progressContainer">
-            <div class="progress-bar">
-                <div class="progress-fill" id="progressFill"></div>
-            </div>
-            <div class="status-text" id="statusText">Initializing...</div>
-        </div>
-
-        <div class="error-message" id="errorMessage"></div>
-
-        <div class="audio-container" id="audioContainer">
-            <audio controls class="audio-player" id="audioPlayer"></audio>
-        </div>
-    </div>
-
-    <div class="connection-status disconnected" id="connectionStatus">Disconnected</div>
+"""
 
-    <script>
+# Page script, served externally for the same caching reason
+_JS_SRC = """
         let ws = null;
         let isConnected = false;
 
+        // Reconnect with exponential backoff plus jitter so a server restart
+        // does not get every client re-handshaking in lockstep
+        let reconnectDelay = 100;
+
         // Initialize WebSocket connection
         function connectWebSocket() {
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
             const wsUrl = `${protocol}//${window.location.host}/ws`;
             
             ws = new WebSocket(wsUrl);
-            
+            ws.binaryType = 'arraybuffer';
+
             ws.onopen = function() {
                 isConnected = true;
+                reconnectDelay = 100;
                 updateConnectionStatus(true);
                 console.log('WebSocket connected');
             };
             
             ws.onmessage = function(event) {
+                if (event.data instanceof ArrayBuffer) {
+                    handleAudioChunk(event.data);
+                    return;
+                }
                 try {
                     const data = JSON.parse(event.data);
                     handleWebSocketMessage(data);
@@ -278,7 +259,9 @@ HTML_TEMPLATE = """
                 isConnected = false;
                 updateConnectionStatus(false);
                 console.log('WebSocket disconnected');
-                setTimeout(connectWebSocket, 3000);
+                const delay = reconnectDelay * (0.75 + Math.random() * 0.5);
+                reconnectDelay = Math.min(reconnectDelay * 2, 6000);
+                setTimeout(connectWebSocket, delay);
             };
             
             ws.onerror = function(error) {
@@ -299,36 +282,116 @@ HTML_TEMPLATE = """
         }
 
         function handleWebSocketMessage(data) {
-            if (data.type === 'progress') {
-                updateProgress(data.progress, data.message);
-            } else if (data.type === 'audio_complete') {
-                handleAudioComplete(data.audio_data);
-            } else if (data.type === 'error') {
-                showError(data.message);
-                hideProgress();
-                resetButton();
+            // JSON.parse gives each message variant its own object shape;
+            // coerce fields into primitives here so the handlers below stay
+            // monomorphic for the optimizer instead of reading from
+            // differently-shaped objects
+            switch (data.type) {
+                case 'progress':
+                    updateProgress(+data.progress, '' + data.message);
+                    break;
+                case 'audio_header':
+                    handleAudioHeader(+data.sample_rate);
+                    break;
+                case 'audio_done':
+                    handleAudioDone();
+                    break;
+                case 'error':
+                    showError('' + data.message);
+                    resetStreamState();
+                    hideProgress();
+                    resetButton();
+                    break;
+            }
+        }
+
+        // State for an in-flight streamed clip: raw PCM pieces plus a Web
+        // Audio context that plays each piece the moment it arrives
+        let streamState = null;
+
+        // One page-wide context reused across generations: browsers cap live
+        // AudioContexts per page, so constructing a fresh one per clip makes
+        // the constructor throw after a handful of generations — and closing
+        // per clip would cut off still-scheduled playback
+        let audioCtx = null;
+
+        function resetStreamState() {
+            streamState = null;
+        }
+
+        function handleAudioHeader(sampleRate) {
+            if (!audioCtx) {
+                audioCtx = new (window.AudioContext || window.webkitAudioContext)();
             }
+            streamState = {
+                sampleRate: sampleRate,
+                chunks: [],
+                totalSamples: 0,
+                context: audioCtx,
+                nextStartTime: 0
+            };
         }
 
-        function handleAudioComplete(audioData) {
+        function handleAudioChunk(buffer) {
+            if (!streamState) return;
+            const pcm = new Int16Array(buffer);
+            streamState.chunks.push(pcm);
+            streamState.totalSamples += pcm.length;
+
+            // Schedule immediate gapless playback of this piece
+            const ctx = streamState.context;
+            const audioBuffer = ctx.createBuffer(1, pcm.length, streamState.sampleRate);
+            const channel = audioBuffer.getChannelData(0);
+            for (let i = 0; i < pcm.length; i++) {
+                channel[i] = pcm[i] / 32768;
+            }
+            const source = ctx.createBufferSource();
+            source.buffer = audioBuffer;
+            source.connect(ctx.destination);
+            const startAt = Math.max(ctx.currentTime, streamState.nextStartTime);
+            source.start(startAt);
+            streamState.nextStartTime = startAt + audioBuffer.duration;
+        }
+
+        function handleAudioDone() {
             hideProgress();
-            
-            const audioBytes = atob(audioData);
-            const audioArray = new Uint8Array(audioBytes.length);
-            for (let i = 0; i < audioBytes.length; i++) {
-                audioArray[i] = audioBytes.charCodeAt(i);
+            if (!streamState) {
+                resetButton();
+                return;
             }
-            
-            const audioBlob = new Blob([audioArray], { type: 'audio/wav' });
-            const audioUrl = URL.createObjectURL(audioBlob);
-            
-            const audioPlayer = document.getElementById('audioPlayer');
-            audioPlayer.src = audioUrl;
-            
+            const audioBlob = pcmChunksToWavBlob(
+                streamState.chunks, streamState.totalSamples, streamState.sampleRate
+            );
+            document.getElementById('audioPlayer').src = URL.createObjectURL(audioBlob);
             document.getElementById('audioContainer').style.display = 'block';
+            resetStreamState();
             resetButton();
         }
 
+        function pcmChunksToWavBlob(chunks, totalSamples, sampleRate) {
+            // 44-byte RIFF header + the PCM pieces, zero-copy via Blob parts
+            const dataSize = totalSamples * 2;
+            const header = new ArrayBuffer(44);
+            const view = new DataView(header);
+            const writeString = (offset, s) => {
+                for (let i = 0; i < s.length; i++) view.setUint8(offset + i, s.charCodeAt(i));
+            };
+            writeString(0, 'RIFF');
+            view.setUint32(4, 36 + dataSize, true);
+            writeString(8, 'WAVE');
+            writeString(12, 'fmt ');
+            view.setUint32(16, 16, true);
+            view.setUint16(20, 1, true);        // PCM
+            view.setUint16(22, 1, true);        // mono
+            view.setUint32(24, sampleRate, true);
+            view.setUint32(28, sampleRate * 2, true);
+            view.setUint16(32, 2, true);
+            view.setUint16(34, 16, true);
+            writeString(36, 'data');
+            view.setUint32(40, dataSize, true);
+            return new Blob([header, ...chunks], { type: 'audio/wav' });
+        }
+
         function generateSpeech() {
             if (!isConnected) {
                 generateSpeechHTTP();
@@ -435,19 +498,35 @@ HTML_TEMPLATE = """
             document.getElementById('generateBtn').textContent = '🎵 Generate Speech';
         }
 
-        function showProgress(progress, message) {
-            document.getElementById('progressContainer').style.display = 'block';
-            document.getElementById('progressFill').style.width = progress + '%';
-            document.getElementById('statusText').textContent = message;
+        // Cache the progress nodes once and batch writes into a single
+        // requestAnimationFrame tick: streamed progress can fire many times
+        // per second, and writing styles on every message forces a layout
+        // per update where one per frame is enough
+        const progressContainerEl = document.getElementById('progressContainer');
+        const progressFillEl = document.getElementById('progressFill');
+        const statusTextEl = document.getElementById('statusText');
+        let pendingProgress = null;
+
+        function flushProgress() {
+            progressFillEl.style.width = pendingProgress.progress + '%';
+            statusTextEl.textContent = pendingProgress.message;
+            pendingProgress = null;
         }
 
         function updateProgress(progress, message) {
-            document.getElementById('progressFill').style.width = progress + '%';
-            document.getElementById('statusText').textContent = message;
+            if (pendingProgress === null) {
+                requestAnimationFrame(flushProgress);
+            }
+            pendingProgress = { progress, message };
+        }
+
+        function showProgress(progress, message) {
+            progressContainerEl.style.display = 'block';
+            updateProgress(progress, message);
         }
 
         function hideProgress() {
-            document.getElementById('progressContainer').style.display = 'none';
+            progressContainerEl.style.display = 'none';
         }
 
         function showError(message) {
@@ -470,25 +549,155 @@ HTML_TEMPLATE = """
         }
 
         // Character counter
-        document.getElementById('textInput').addEventListener('input', function() {
-            const text = this.value;
-            const count = text.length;
-            document.getElementById('charCounter').textContent = `${count}/1000`;
-            
-            if (count > 1000) {
-                document.getElementById('charCounter').style.color = '#dc3545';
-            } else {
-                document.getElementById('charCounter').style.color = '#666';
-            }
+        // Character counter: cache the nodes and batch the two style-
+        // invalidating writes into one rAF tick per typing burst, instead of
+        // two DOM lookups and writes on every keystroke
+        const textInputEl = document.getElementById('textInput');
+        const charCounterEl = document.getElementById('charCounter');
+        let charCountPending = false;
+
+        textInputEl.addEventListener('input', () => {
+            if (charCountPending) return;
+            charCountPending = true;
+            requestAnimationFrame(() => {
+                const count = textInputEl.value.length;
+                charCounterEl.textContent = `${count}/1000`;
+                charCounterEl.style.color = count > 1000 ? '#dc3545' : '#666';
+                charCountPending = false;
+            });
         });
 
         // Initialize character counter
-        document.getElementById('textInput').dispatchEvent(new Event('input'));
+        textInputEl.dispatchEvent(new Event('input'));
 
         // Connect WebSocket when page loads
         connectWebSocket();
-    </script>
+
+        // Keepalive so idle proxies don't drop the socket and force a
+        // reconnect storm
+        setInterval(() => {
+            if (ws && ws.readyState === WebSocket.OPEN) {
+                ws.send('{"type":"ping"}');
+            }
+        }, 30000);
+"""
+
+# Minify once at import and address the assets by content hash, so they can
+# be cached forever: a changed asset gets a new URL instead of a stale hit
+CSS = cssmin(_CSS_SRC)
+JS = jsmin(_JS_SRC)
+CSS_HASH = hashlib.sha1(CSS.encode()).hexdigest()[:10]
+JS_HASH = hashlib.sha1(JS.encode()).hexdigest()[:10]
+
+_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+STATIC_FILES = {
+    f"app.{CSS_HASH}.css": (CSS.encode("utf-8"), "text/css"),
+    f"app.{JS_HASH}.js": (JS.encode("utf-8"), "application/javascript"),
+}
+
+
+def static_response(filename: str) -> Response:
+    """Serve one of the content-hashed assets with an immutable cache policy."""
+    entry = STATIC_FILES.get(filename)
+    if entry is None:
+        return Response(status_code=404)
+    content, media_type = entry
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"cache-control": _IMMUTABLE_CACHE}
+    )
+
+
+# Web interface HTML with WebSocket streaming support; styles and script are
+# referenced externally so repeat loads only fetch this small shell
+HTML_TEMPLATE = (
+    """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Chatterbox TTS - Real-time Streaming</title>
+    <link rel="stylesheet" href="/static/app.""" + CSS_HASH + """.css">
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🗣️ Chatterbox TTS</h1>
+            <p>Real-time Text-to-Speech with Voice Cloning</p>
+        </div>
+
+        <div class="form-group">
+            <label for="textInput">Text to synthesize:</label>
+            <textarea id="textInput" placeholder="Enter the text you want to convert to speech (max 1000 characters)">Hello! This is a test of the Chatterbox TTS system with real-time streaming.</textarea>
+            <div class="char-counter" id="charCounter">0/1000</div>
+        </div>
+
+        <div class="accordion">
+            <div class="accordion-header" onclick="toggleAccordion()">
+                🎤 Voice Cloning (Optional)
+                <span id="accordionIcon">▼</span>
+            </div>
+            <div class="accordion-content" id="accordionContent">
+                <input type="file" id="voiceFile" accept="audio/*" class="file-input">
+                <div style="margin-top: 10px; font-size: 0.9em; color: #666;">
+                    Upload a clear audio sample (5-30 seconds) to clone a voice. Supported formats: WAV, MP3, MPEG.
+                </div>
+            </div>
+        </div>
+
+        <button class="generate-btn" id="generateBtn" onclick="generateSpeech()">
+            🎵 Generate Speech
+        </button>
+
+        <div class="progress-container" id="progressContainer">
+            <div class="progress-bar">
+                <div class="progress-fill" id="progressFill"></div>
+            </div>
+            <div class="status-text" id="statusText">Initializing...</div>
+        </div>
+
+        <div class="error-message" id="errorMessage"></div>
+
+        <div class="audio-container" id="audioContainer">
+            <audio controls class="audio-player" id="audioPlayer"></audio>
+        </div>
+    </div>
+
+    <div class="connection-status disconnected" id="connectionStatus">Disconnected</div>
+    <script src="/static/app.""" + JS_HASH + """.js"></script>
 </body>
 </html>
 """
-
+)
+
+
+# Encode and compress the page once at import: serving it becomes a header
+# pick plus a reference to pre-built bytes, with no per-request UTF-8 encode
+# or middleware compression pass
+HTML_BYTES = HTML_TEMPLATE.encode("utf-8")
+HTML_GZ = gzip.compress(HTML_BYTES, 9)
+HTML_BR = brotli.compress(HTML_BYTES, quality=11) if brotli else None
+HTML_ETAG = f'"{hashlib.sha1(HTML_BYTES).hexdigest()}"'
+
+
+def html_response(accept_encoding: str = "", if_none_match: str = None) -> Response:
+    """Serve the cached page, honoring Accept-Encoding and the ETag.
+
+    Picks br > gzip > identity from the pre-compressed variants; a matching
+    If-None-Match short-circuits to an empty 304.
+    """
+    if if_none_match == HTML_ETAG:
+        return Response(status_code=304, headers={"etag": HTML_ETAG})
+    headers = {"etag": HTML_ETAG, "vary": "accept-encoding"}
+    if HTML_BR is not None and "br" in accept_encoding:
+        headers["content-encoding"] = "br"
+        content = HTML_BR
+    elif "gzip" in accept_encoding:
+        headers["content-encoding"] = "gzip"
+        content = HTML_GZ
+    else:
+        content = HTML_BYTES
+    return Response(content=content, media_type="text/html", headers=headers)
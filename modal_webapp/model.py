@@ -1,6 +1,7 @@
 # Model loading and global instance for Chatterbox TTS
 import os
 import tempfile
+import threading
 import io
 import base64
 
@@ -28,6 +29,198 @@ def get_model():
         if ChatterboxTTS is None:
             raise RuntimeError("ChatterboxTTS not available. Make sure dependencies are installed.")
         print("Loading Chatterbox TTS model...")
+        _tune_backends()
         tts_model = ChatterboxTTS.from_pretrained(device="cuda")
+        _optimize_model(tts_model)
         print(f"Model loaded successfully! Sample rate: {tts_model.sr}")
     return tts_model
+
+def _tune_backends():
+    """Enable TF32 matmuls and cudnn autotuning once before the model loads.
+
+    TF32 runs fp32 matmuls on tensor cores at negligible precision cost;
+    cudnn.benchmark profiles conv algorithms on first use, which pays off
+    for the vocoder's conv stack since input shapes repeat.
+    """
+    import torch
+
+    try:
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.benchmark = True
+    except Exception as e:
+        print(f"Backend tuning unavailable: {e}")
+
+def _optimize_model(model):
+    """Quantize and compile the model, rolling back if it cannot generate.
+
+    The warmup generate both pays the one-time compile cost up front and
+    proves the optimized model actually works — a dtype mismatch from the
+    half-precision cast or a compile bug would otherwise make every user
+    request raise for the container's lifetime. On warmup failure the
+    eager modules are restored (undoing the in-place half-precision cast)
+    and warmed up again before the model is declared loaded.
+    """
+    eager_t3, eager_s3gen = model.t3, model.s3gen
+    changed = _quantize_model(model)
+    changed = _compile_model(model) or changed
+    if not changed:
+        return
+    print("Warming up optimized model...")
+    if _warmup(model):
+        return
+    print("Optimized model failed warmup; rolling back to eager fp32")
+    model.t3 = eager_t3.float()
+    model.s3gen = eager_s3gen.float()
+    if not _warmup(model):
+        print("Eager fallback also failed warmup; model may be unusable")
+
+def _warmup(model) -> bool:
+    """Run one generation to trigger compilation and prove the model works."""
+    try:
+        model.generate("Warmup.")
+        return True
+    except Exception as e:
+        print(f"Warmup generate failed: {e}")
+        return False
+
+def _quantize_model(model) -> bool:
+    """Drop the language model to half precision.
+
+    The decode loop is bound on reading weights from HBM, so halving the
+    weight bytes roughly halves per-step time, and tensor cores double
+    throughput on the matmuls. Ampere and newer take bfloat16 (same range
+    as fp32, no loss-scaling concerns); older cards get fp16. The s3gen
+    vocoder stays fp32 — it is a small fraction of the runtime and its
+    output quality is the part most sensitive to reduced precision.
+    """
+    import torch
+
+    try:
+        if not torch.cuda.is_available():
+            return False
+        if torch.cuda.get_device_capability()[0] >= 8:
+            model.t3 = model.t3.to(torch.bfloat16)
+            print("Quantized t3 to bfloat16")
+        else:
+            model.t3 = model.t3.half()
+            print("Quantized t3 to float16")
+        return True
+    except Exception as e:
+        print(f"Quantization failed, staying fp32: {e}")
+        return False
+
+def _compile_model(model) -> bool:
+    """Compile the model's submodules with CUDA graph capture.
+
+    reduce-overhead collapses the per-step kernel-launch overhead of eager
+    dispatch across the hundreds of decode steps in a generation. Any
+    failure leaves the model eager aside from a log line.
+    """
+    import torch
+
+    try:
+        model.t3 = torch.compile(model.t3, mode="reduce-overhead", fullgraph=False)
+        model.s3gen = torch.compile(model.s3gen, mode="reduce-overhead")
+        return True
+    except Exception as e:
+        print(f"torch.compile unavailable, staying eager: {e}")
+        return False
+
+# Cache of prepared voice-prompt conditionals keyed by a hash of the uploaded
+# reference bytes. Re-using the same reference with different text then skips
+# the expensive speaker-embedding/conditioning step entirely.
+_reference_cache = {}
+MAX_REFERENCE_CACHE = 32
+
+def has_cached_reference(reference_key) -> bool:
+    """Check whether conditionals for this reference are already cached."""
+    return reference_key in _reference_cache
+
+def cache_reference(reference_key, conds):
+    """Cache prepared conditionals under the reference's content hash."""
+    if len(_reference_cache) >= MAX_REFERENCE_CACHE:
+        # Drop the oldest entry (insertion order) to bound memory use
+        _reference_cache.pop(next(iter(_reference_cache)))
+    _reference_cache[reference_key] = conds
+
+def apply_cached_reference(model, reference_key) -> bool:
+    """Point the model at cached conditionals; returns False on a miss."""
+    conds = _reference_cache.get(reference_key)
+    if conds is None:
+        return False
+    model.conds = conds
+    return True
+
+# Generation is stateful: voice conditioning lives on model.conds, which a
+# prompted generate() or apply_cached_reference() mutates and an unprompted
+# generate() reads. Every generation — WebSocket and HTTP-batch alike — must
+# hold this lock, and must (re)apply its own conditioning inside the locked
+# region, so concurrent requests cannot swap voices under each other. The
+# lock runs in worker threads, hence threading.Lock rather than asyncio.
+_GEN_LOCK = threading.Lock()
+
+def _generate_one(model, text, audio_prompt_path, reference_key, prompt_bytes=None):
+    """Generate a single item, reusing cached conditionals when possible.
+
+    Callers must hold _GEN_LOCK; conditioning is applied here, immediately
+    before the generate, so it cannot be clobbered by another request.
+    prompt_bytes backs up the cache: the bounded cache can evict an entry
+    between a caller's has_cached_reference check and this generate, and
+    without a fallback that request would silently get the default voice.
+    """
+    if reference_key is not None and apply_cached_reference(model, reference_key):
+        return model.generate(text)
+    if audio_prompt_path is None and prompt_bytes is not None:
+        # Cache entry was evicted after the caller skipped the temp-file
+        # write; rebuild the prompt file from the retained bytes
+        from .audio_utils import save_temp_audio_file
+        audio_prompt_path = save_temp_audio_file(prompt_bytes)
+        try:
+            return _generate_one(model, text, audio_prompt_path, reference_key)
+        finally:
+            os.unlink(audio_prompt_path)
+    if audio_prompt_path:
+        wav = model.generate(text, audio_prompt_path=audio_prompt_path)
+        if reference_key is not None and getattr(model, "conds", None) is not None:
+            cache_reference(reference_key, model.conds)
+        return wav
+    return model.generate(text)
+
+def generate_one(model, text, audio_prompt_path=None, reference_key=None, prompt_bytes=None):
+    """Generate a single clip under the shared generation lock."""
+    import torch
+
+    with _GEN_LOCK:
+        with torch.inference_mode():
+            return _generate_one(model, text, audio_prompt_path, reference_key, prompt_bytes)
+
+def generate_batch(items):
+    """Generate audio for a batch of (text, audio_prompt_path, reference_key,
+    prompt_bytes) requests.
+
+    Uses the model's native batched generation when available so coalesced
+    requests share a single forward pass; otherwise falls back to generating
+    each item sequentially.
+    """
+    import torch
+
+    model = get_model()
+    # inference_mode drops autograd bookkeeping (version counters, view
+    # tracking) that forward-only generation never needs
+    with _GEN_LOCK:
+        with torch.inference_mode():
+            batched = getattr(model, "generate_batch", None)
+            if batched is not None and not any(path or key for _, path, key, _ in items):
+                return batched([text for text, _, _, _ in items])
+            # Coalescing must stay transparent: one item's bad input (e.g. a
+            # corrupt voice prompt) fails only that request, returned as the
+            # exception in its slot instead of poisoning the whole batch
+            results = []
+            for text, audio_prompt_path, reference_key, prompt_bytes in items:
+                try:
+                    results.append(_generate_one(
+                        model, text, audio_prompt_path, reference_key, prompt_bytes
+                    ))
+                except Exception as e:
+                    results.append(e)
+            return results
@@ -1,21 +1,98 @@
 # FastAPI route definitions for Chatterbox TTS Web App
+import asyncio
+import hashlib
 import io
 import json
 import os
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Form, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse
-from .html_template import HTML_TEMPLATE
-from .model import tts_model, get_model
-from .audio_utils import save_temp_audio_file
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
+
+# orjson serializes responses several times faster than the stdlib encoder
+try:
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+    import orjson  # noqa: F401 — ORJSONResponse needs it at render time
+except ImportError:
+    from fastapi.responses import JSONResponse as _DefaultResponse
+from .html_template import html_response, static_response
+from .model import tts_model, get_model, generate_batch, has_cached_reference
+from .audio_utils import save_temp_audio_file, audio_to_wav_bytes
 from .tts_handlers import handle_tts_generation
 
+# Request coalescing: concurrent /generate_streaming requests are queued and
+# drained in batches by a background worker so they can share a single
+# forward pass instead of serializing through model.generate() one by one.
+MAX_BATCH_SIZE = 8
+MAX_BATCH_WAIT_MS = 40
+
+_request_queue = None
+# Strong reference to the worker task: the event loop only keeps weak
+# references, so without this the worker could be garbage-collected mid-run
+# and every queued request would hang on its future
+_batch_worker_task = None
+
+
+async def _batch_worker():
+    """Drain queued requests into batches and resolve their futures."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _request_queue.get()]
+        deadline = loop.time() + MAX_BATCH_WAIT_MS / 1000
+        # Collect more requests until the batch is full or the window closes
+        while len(batch) < MAX_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_request_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        items = [(text, path, key, prompt) for text, path, key, prompt, _ in batch]
+        try:
+            wavs = await loop.run_in_executor(None, generate_batch, items)
+            # A per-item failure comes back as the exception in that item's
+            # slot; only the offending request sees it
+            for (_, _, _, _, future), wav in zip(batch, wavs):
+                if future.done():
+                    continue
+                if isinstance(wav, Exception):
+                    future.set_exception(wav)
+                else:
+                    future.set_result(wav)
+        except Exception as e:
+            for _, _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+async def _generate_coalesced(text: str, audio_prompt_path=None, reference_key=None,
+                              prompt_bytes=None):
+    """Submit a generation request to the batch worker and await its result."""
+    future = asyncio.get_running_loop().create_future()
+    await _request_queue.put((text, audio_prompt_path, reference_key, prompt_bytes, future))
+    return await future
+
 
 def create_web_app():
-    web_app = FastAPI(title="Chatterbox TTS Web App")
+    web_app = FastAPI(title="Chatterbox TTS Web App", default_response_class=_DefaultResponse)
+
+    @web_app.on_event("startup")
+    async def start_batch_worker():
+        global _request_queue, _batch_worker_task
+        _request_queue = asyncio.Queue()
+        _batch_worker_task = asyncio.create_task(_batch_worker())
 
     @web_app.get("/")
-    async def serve_web_app():
-        return HTMLResponse(content=HTML_TEMPLATE)
+    async def serve_web_app(request: Request):
+        # Pre-compressed at import; picks br/gzip/identity and honors ETag
+        return html_response(
+            request.headers.get("accept-encoding", ""),
+            request.headers.get("if-none-match")
+        )
+
+    @web_app.get("/static/{filename}")
+    async def serve_static(filename: str):
+        # Content-hashed CSS/JS assets, cacheable forever
+        return static_response(filename)
 
     @web_app.get("/health")
     async def health_check():
@@ -54,30 +131,33 @@ def create_web_app():
             if len(text) > 1000:
                 raise HTTPException(status_code=400, detail="Text too long (max 1000 characters)")
             audio_prompt_path = None
+            reference_key = None
+            prompt_bytes = None
             if voice_prompt:
-                audio_data = await voice_prompt.read()
-                audio_prompt_path = save_temp_audio_file(audio_data)            
+                # The bytes are kept for the whole request: if the bounded
+                # conditioning cache evicts this entry before the batch
+                # worker runs, generation rebuilds the prompt from them
+                # instead of silently using the default voice
+                prompt_bytes = await voice_prompt.read()
+                # Key the conditioning cache by content hash so repeated uploads
+                # of the same reference skip the temp file and re-encoding
+                reference_key = hashlib.blake2b(prompt_bytes, digest_size=16).digest()
+                if not has_cached_reference(reference_key):
+                    audio_prompt_path = save_temp_audio_file(prompt_bytes)
                 print(f"Generating audio for text: {text[:50]}...")
-            model = get_model()
-            if audio_prompt_path:
-                wav = model.generate(text, audio_prompt_path=audio_prompt_path)
-                os.unlink(audio_prompt_path)
-            else:
-                wav = model.generate(text)
-            
-            # Import torchaudio safely
             try:
-                import modal
-                with modal.imports():
-                    import torchaudio as ta
-            except (ImportError, AttributeError):
-                import torchaudio as ta
-            
-            buffer = io.BytesIO()
-            ta.save(buffer, wav, model.sr, format="wav")
-            buffer.seek(0)
+                wav = await _generate_coalesced(text, audio_prompt_path, reference_key, prompt_bytes)
+            finally:
+                # A failed generation must not leak the prompt file — it
+                # lives in tmpfs, so a leak pins RAM for the container's life
+                if audio_prompt_path:
+                    try:
+                        os.unlink(audio_prompt_path)
+                    except OSError:
+                        pass
+            model = get_model()
             return StreamingResponse(
-                io.BytesIO(buffer.read()),
+                io.BytesIO(audio_to_wav_bytes(wav)),
                 media_type="audio/wav",
                 headers={
                     "Content-Disposition": "attachment; filename=generated_speech.wav",